@@ -0,0 +1,183 @@
+"""
+Email extraction micro-benchmark
+
+Times the page parsing step of email_extractor.py (find the emails and
+links of a page, then filter and rank the emails) on a folder of saved
+pages: the old BeautifulSoup implementation against the current single
+regex pass. Also checks that both find the same emails.
+
+A page saved as <domain>.html (e.g. acme.com.html) is ranked against that
+domain; other file names are parsed without a domain.
+
+Usage:
+    python benchmark_email_extraction.py saved_pages/
+    python benchmark_email_extraction.py saved_pages/ --repeat 5
+    python benchmark_email_extraction.py --synthetic 300
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from email_extractor import EmailExtractor
+
+
+class LegacyExtractor(EmailExtractor):
+    """The parsing code as it was before the single-pass rewrite"""
+
+    email_pattern = re.compile(r'\b[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+    def is_valid_email(self, email):
+        email_lower = email.lower()
+        for pattern in self.false_positive_patterns:
+            if re.search(pattern, email_lower):
+                return False
+        try:
+            email_domain = email_lower.split('@')[1]
+            if any(excluded in email_domain for excluded in self.exclude_domains):
+                return False
+        except IndexError:
+            return False
+        parts = email_lower.split('@')
+        if len(parts) != 2 or len(parts[0]) < 3 or len(parts[1]) < 3:
+            return False
+        placeholder_keywords = ['example', 'test', 'esimerkki', 'placeholder', 'sample']
+        if any(keyword in email_lower for keyword in placeholder_keywords):
+            return False
+        return True
+
+    def extract_emails_from_text(self, text, website_domain):
+        valid_emails = []
+        for email in self.email_pattern.findall(text):
+            email = email.lower().strip()
+            if not self.is_valid_email(email):
+                continue
+            if website_domain and website_domain in email.split('@')[1]:
+                valid_emails.insert(0, email)
+            else:
+                valid_emails.append(email)
+        return list(dict.fromkeys(valid_emails))
+
+    def parse_page(self, html_content, domain):
+        emails = self.extract_emails_from_text(html_content, domain)
+        links = []
+        soup = BeautifulSoup(html_content, 'html.parser')
+        for link in soup.find_all('a', href=True):
+            if link['href'].startswith('mailto:'):
+                email = link['href'].replace('mailto:', '').split('?')[0].lower().strip()
+                if self.is_valid_email(email):
+                    emails.append(email)
+            else:
+                text = ' '.join(filter(None, [link.get_text(' ', strip=True), link.get('title'), link.get('aria-label')]))
+                links.append((link['href'], text))
+        return emails, links
+
+    def finish_emails(self, all_emails, domain):
+        return self.extract_emails_from_text(' '.join(all_emails), domain)
+
+
+def page_domain(filename):
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return stem.lower() if '.' in stem else None
+
+
+def load_pages(folder):
+    pages = []
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(('.html', '.htm')):
+            with open(os.path.join(folder, name), encoding='utf-8', errors='replace') as f:
+                pages.append((name, page_domain(name), f.read()))
+    return pages
+
+
+def synthetic_pages(count, seed=7):
+    """Business homepages of 20-400 KB: menus, scripts, retina images and a few emails"""
+    rng = random.Random(seed)
+    words = ['about', 'services', 'quality', 'team', 'contact', 'fresh', 'local', 'since', 'family', 'order']
+    pages = []
+    for i in range(count):
+        domain = f"shop{i}.com"
+        parts = ['<!DOCTYPE html><html><head><title>Shop</title>',
+                 '<script>var cfg = {"cdn": "https://cdn.shop.net/a.js", "id": "%08x-%04x-4abc"};</script>'
+                 % (rng.getrandbits(32), rng.getrandbits(16)),
+                 '</head><body><nav>']
+        for word in rng.sample(words, 6):
+            parts.append(f'<a href="/{word}" title="{word.title()}"><span>{word.title()}</span></a>')
+        parts.append('</nav>')
+        for _ in range(rng.randint(20, 400)):
+            parts.append(f'<div class="card"><img src="/img/item_{rng.randint(1, 99)}@2x.png">'
+                         f'<p>{" ".join(rng.choice(words) for _ in range(120))}</p></div>')
+        kind = rng.random()
+        if kind < 0.4:
+            parts.append(f'<footer><a href="mailto:info@{domain}?subject=Hi">Email us</a></footer>')
+        elif kind < 0.7:
+            parts.append(f'<footer>Write to sales@{domain} or help@support-desk.io</footer>')
+        elif kind < 0.8:
+            parts.append('<footer><a href="mailto:owner%40gmail.com">owner</a> test@example.com</footer>')
+        elif kind < 0.9:
+            # Leading punctuation, URL escapes and over-long local parts
+            parts.append(f'<footer>-sales@{domain} <a href="/c?to=%20info@{domain}">Mail</a> '
+                         f'{"orders." * 12}desk@{domain}</footer>')
+        parts.append('</body></html>')
+        pages.append((f"{domain}.html", domain, ''.join(parts)))
+    return pages
+
+
+def run(extractor, pages, repeat):
+    """Seconds for repeat passes over the pages, and the emails of the last pass"""
+    found = {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, domain, text in pages:
+            emails, links = extractor.parse_page(text, domain)
+            found[name] = extractor.finish_emails(emails, domain)
+    return time.perf_counter() - start, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark email extraction on saved pages')
+    parser.add_argument('folder', nargs='?', help='Folder of saved pages (*.html, *.htm)')
+    parser.add_argument('--synthetic', type=int, metavar='N', help='Benchmark N generated pages instead')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the pages (default: 3)')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        pages = synthetic_pages(args.synthetic)
+    elif args.folder and os.path.isdir(args.folder):
+        pages = load_pages(args.folder)
+    else:
+        parser.print_help()
+        print("\nError: give a folder of saved pages or --synthetic N")
+        sys.exit(1)
+    if not pages:
+        print(f"Error: No .html/.htm files in {args.folder}")
+        sys.exit(1)
+
+    # finish_emails logs every page at INFO
+    logging.getLogger('email_extractor').setLevel(logging.WARNING)
+    size_mb = sum(len(text.encode('utf-8')) for _, _, text in pages) / 1e6
+    print(f"Pages: {len(pages)} ({size_mb:.1f} MB), {args.repeat} passes")
+
+    legacy_time, legacy_found = run(LegacyExtractor(), pages, args.repeat)
+    current_time, current_found = run(EmailExtractor(), pages, args.repeat)
+
+    total = len(pages) * args.repeat
+    for label, seconds in (('legacy (BeautifulSoup)', legacy_time), ('current (single pass)', current_time)):
+        print(f"{label:24} {total / seconds:8.1f} pages/s  {size_mb * args.repeat / seconds:6.1f} MB/s")
+    print(f"{'speed-up':24} {legacy_time / current_time:8.1f}x")
+
+    same = [name for name, _, _ in pages if set(legacy_found[name]) == set(current_found[name])]
+    print(f"Same emails on {len(same)}/{len(pages)} pages")
+    for name, _, _ in pages:
+        if name not in same:
+            print(f"   {name}: legacy {legacy_found[name]} / current {current_found[name]}")
+
+
+if __name__ == "__main__":
+    main()
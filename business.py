@@ -0,0 +1,338 @@
+"""
+Business record shared by the scraper, the GUI and the email extractor
+
+One slotted object per listing instead of a dict of strings. Numbers are
+parsed once when the record is built, and export rows are produced on
+demand with to_row(). Also home to the JSON Lines and streaming JSON
+readers/writers both tools use.
+"""
+
+import gzip
+import json
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Optional: much faster JSON encoding/decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional: zstd compression for .zst files
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Column order of CSV/JSON/database exports
+EXPORT_FIELDS = [
+    'id', 'name', 'description', 'rating', 'reviewCount', 'phone', 'email', 'website',
+    'address', 'hours', 'image', 'verified', 'tags', 'city', 'placeId', 'query'
+]
+
+# Export column -> record attribute, where the names differ
+FIELD_ATTRIBUTES = {
+    'id': 'id',
+    'name': 'company',
+    'company': 'company',
+    'rating': 'rating',
+    'reviewCount': 'reviews',
+    'reviews': 'reviews',
+    'phone': 'phone',
+    'email': 'email',
+    'all_emails': 'all_emails',
+    'website': 'website',
+    'address': 'address',
+    'hours': 'hours',
+    'image': 'image',
+    'city': 'city',
+    'placeId': 'place_id',
+    'place_id': 'place_id',
+    'query': 'query'
+}
+
+# Identical key layouts share one tuple instead of one list per record
+_field_layouts = {}
+
+
+def parse_float(value):
+    """'4.5' -> 4.5, '4,5' -> 4.5, '' -> None"""
+    if value is None or isinstance(value, float):
+        return value
+    if isinstance(value, (int, bool)):
+        return float(value)
+    try:
+        return float(str(value).strip().replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def parse_int(value):
+    """'1,234' -> 1234, '' -> None"""
+    if value is None or isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    try:
+        return int(re.sub(r'[\s,\u00a0\u202f]', '', str(value)))
+    except ValueError:
+        return None
+
+
+def export_text(value):
+    """Text form of an export value for CSV and text database columns"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+@dataclass(slots=True)
+class Business:
+    company: str = ''
+    address: str = ''
+    phone: str = ''
+    website: str = ''
+    email: str = ''
+    rating: Optional[float] = None
+    reviews: Optional[int] = None
+    hours: str = ''
+    image: str = ''
+    place_id: str = ''
+    city: str = ''
+    # Search query that found the listing ('a; b' when several matched it)
+    query: str = ''
+    id: object = None
+    all_emails: str = ''
+    # Columns from input files that the record has no field for
+    extra: Optional[dict] = None
+    # Key order of the input row, so files round-trip unchanged
+    fields: Optional[tuple] = None
+    # Input column -> (parsed value, original value) where parsing changed it;
+    # the original is exported again as long as the record keeps that value
+    raw: Optional[dict] = None
+
+    @property
+    def verified(self):
+        return self.rating is not None
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a record from an export row (or a legacy scraper dict)"""
+        business = cls()
+        for key, value in row.items():
+            attribute = FIELD_ATTRIBUTES.get(key)
+            if attribute == 'rating':
+                business.rating = parse_float(value)
+            elif attribute == 'reviews':
+                business.reviews = parse_int(value)
+            elif attribute == 'id':
+                business.id = value
+            elif attribute:
+                setattr(business, attribute, '' if value is None else str(value))
+            elif key != 'verified':
+                if business.extra is None:
+                    business.extra = {}
+                business.extra[key] = value
+        # Keep what parsing changed ("N/A" ratings, "yes" for verified, ...)
+        for key, value in row.items():
+            if key == 'verified' or key in FIELD_ATTRIBUTES:
+                parsed = business.get(key)
+                if value != parsed or type(value) is not type(parsed):
+                    if business.raw is None:
+                        business.raw = {}
+                    business.raw[key] = (parsed, value)
+        layout = tuple(row.keys())
+        business.fields = _field_layouts.setdefault(layout, layout)
+        return business
+
+    def get(self, field, default=''):
+        """Value of an export column (the input's own value while it is unchanged)"""
+        attribute = FIELD_ATTRIBUTES.get(field)
+        if field == 'verified':
+            value = self.verified
+        elif attribute:
+            value = getattr(self, attribute)
+        elif self.extra and field in self.extra:
+            return self.extra[field]
+        else:
+            return default
+        if self.raw and field in self.raw:
+            parsed, original = self.raw[field]
+            if value == parsed and type(value) is type(parsed):
+                return original
+        return value
+
+    def to_row(self, idx=None, fields=None):
+        """
+        Export row with typed values (float rating, int reviewCount, bool verified)
+
+        Args:
+            idx: Row id to use (defaults to the record's own id)
+            fields: Columns to emit (defaults to the input layout, else EXPORT_FIELDS)
+        """
+        fields = fields or self.fields or EXPORT_FIELDS
+        row = {field: self.get(field) for field in fields}
+        if 'id' in row and idx is not None:
+            row['id'] = idx
+        return row
+
+    def add_query(self, query):
+        """Tag the record with one more query that matched it"""
+        queries = self.query.split('; ') if self.query else []
+        if query and query not in queries:
+            self.query = '; '.join(queries + [query])
+
+    def add_field(self, field):
+        """Make an input-row record emit a column it did not have"""
+        if self.fields is not None and field not in self.fields:
+            layout = self.fields + (field,)
+            self.fields = _field_layouts.setdefault(layout, layout)
+
+
+# --- JSON Lines I/O ---
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson', '.jsonl.gz', '.ndjson.gz', '.jsonl.zst', '.ndjson.zst')
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def is_jsonl_file(path):
+    return path.lower().endswith(JSONL_EXTENSIONS)
+
+
+def open_text(path, mode='r'):
+    """Open a text file, transparently (de)compressing .gz and .zst"""
+    lower = path.lower()
+    if lower.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if lower.endswith('.zst'):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard not installed. Run: pip install zstandard")
+        return zstandard.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def dumps_json(obj):
+    """Compact single-line JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def loads_json(text):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def iter_jsonl(path):
+    """Yield one dict per non-empty line"""
+    with open_text(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield loads_json(line)
+
+
+def write_jsonl(path, rows, mode='w'):
+    """Write rows as JSON Lines ('a' appends). Returns the number of rows."""
+    count = 0
+    with open_text(path, mode) as f:
+        for row in rows:
+            f.write(dumps_json(row))
+            f.write('\n')
+            count += 1
+    return count
+
+
+# --- Streaming JSON arrays ---
+def iter_json_array(path, chunk_size=1 << 20):
+    """
+    Yield the items of a file holding one JSON array, without loading it whole
+
+    The file is read chunk_size characters at a time and each item is
+    decoded with raw_decode as soon as it is complete.
+    """
+    decoder = json.JSONDecoder()
+    with open_text(path, 'r') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+
+        def fill():
+            # Drop what was consumed and read one more chunk; False at end of file
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            return bool(chunk)
+
+        def next_char():
+            # Position of the next non-blank character, reading on as needed
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return pos < len(buffer)
+
+        if not next_char() or buffer[pos] != '[':
+            raise json.JSONDecodeError("Expecting '['", buffer, pos)
+        pos += 1
+        expect_item = True
+        can_close = True
+        while True:
+            if not next_char():
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            if not expect_item or can_close:
+                if buffer[pos] == ']':
+                    return
+            if not expect_item:
+                if buffer[pos] != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                pos += 1
+                expect_item = True
+                can_close = False
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # A number at the very end of the buffer may go on in the next chunk
+                complete = end < len(buffer) or eof
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                fill()
+                continue
+            yield item
+            pos = end
+            expect_item = False
+            can_close = True
+
+
+class JsonArrayWriter:
+    """Write a JSON array one item at a time (same layout as json.dump(..., indent=2))"""
+
+    def __init__(self, path):
+        self.file = open_text(path, 'w')
+        self.count = 0
+
+    def write(self, row):
+        text = json.dumps(row, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+        self.file.write(('[\n  ' if not self.count else ',\n  ') + text)
+        self.count += 1
+
+    def close(self):
+        self.file.write('\n]' if self.count else '[]')
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -5,17 +5,30 @@ Author: Email Extractor Team
 License: MIT
 """
 
+import asyncio
+import html
 import json
 import csv
 import re
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import time
-import random
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlparse, unquote
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import logging
+import os
 import sys
+import threading
+from collections import deque
+
+from business import (Business, JsonArrayWriter, export_text, is_jsonl_file, iter_json_array, iter_jsonl,
+                      write_jsonl, JSONL_EXTENSIONS)
+from http_client import (HostScheduler, HttpClient, ResponseCache, StreamedBody, fetch_text,
+                         is_text_content, lookup, CHUNK_SIZE, MAX_PAGE_BYTES)
+
+# Optional: asyncio fetch engine (--mode async)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
 __version__ = "1.1.1"
 __author__ = "Pashalis Laoutaris"
@@ -23,26 +36,163 @@ __author__ = "Pashalis Laoutaris"
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Guessed contact pages, tried in this order after a homepage miss
+PAGES_TO_TRY = [
+    'contact', 'contact-us', 'contactus',
+    'about', 'about-us', 'aboutus',
+    'privacy', 'privacy-policy',
+    'terms', 'legal',
+    'our-story', 'story',
+    'team', 'our-team',
+    'support', 'help',
+    'impressum', 'imprint',
+    'company'
+]
+
+# Words that mark a contact-like page, in URLs or link text (several languages).
+# Weight 3: the page is about contacting; 2: usually lists an address; 1: sometimes does
+CONTACT_TERMS = {
+    'contact': 3, 'kontakt': 3, 'contacto': 3, 'contato': 3, 'contatti': 3, 'contatto': 3,
+    'contactez': 3, 'nous-contacter': 3, 'yhteystiedot': 3, 'yhteys': 3, 'kontakta': 3,
+    'impressum': 3, 'imprint': 3, 'epikoinonia': 3, 'επικοινωνία': 3, 'επικοινωνια': 3,
+    'お問い合わせ': 3, '問い合わせ': 3, '联系': 3, 'связаться': 3, 'контакты': 3, 'iletisim': 3, 'iletişim': 3,
+    'about': 2, 'ueber-uns': 2, 'uber-uns': 2, 'über uns': 2, 'über-uns': 2, 'chi-siamo': 2, 'chi siamo': 2,
+    'quienes-somos': 2, 'quiénes somos': 2, 'sobre-nosotros': 2, 'sobre nós': 2, 'a-propos': 2, 'à propos': 2,
+    'qui-sommes-nous': 2, 'over-ons': 2, 'om-oss': 2, 'om oss': 2, 'meista': 2, 'meistä': 2, 'tietoa': 2,
+    'σχετικά': 2, 'legal': 2, 'mentions-legales': 2, 'mentions légales': 2, 'aviso-legal': 2, 'note-legali': 2,
+    'team': 1, 'privacy': 1, 'datenschutz': 1, 'support': 1, 'help': 1, 'terms': 1, 'company': 1,
+    'location': 1, 'store': 1, 'reach us': 1, 'get in touch': 3, 'email us': 3, 'write to us': 3
+}
+
+# Emails are found from their '@' (a fast literal search), then the local part
+# is read backwards from it; much cheaper than trying a match at every word.
+EMAIL_DOMAIN_PATTERN = r'@(?P<domain>[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+AT_PATTERN = re.compile(EMAIL_DOMAIN_PATTERN)
+LOCAL_RUN_PATTERN = re.compile(r'[A-Za-z0-9._%+-]*\Z')
+# Where the local part starts within that run: '-john@' -> 'john@', '%20info@' -> '20info@'
+LOCAL_START_PATTERN = re.compile(r'\b[A-Za-z0-9]')
+# One scan per page that only stops at '<' and '@': <a> tags (for mailto: and
+# contact links) and bare emails. Anchor text may hold up to 30 nested tags.
+ANCHOR_PATTERN = r'<[aA]\s(?P<attrs>[^>]*)>(?P<text>[^<]*(?:<(?!/[aA]\s*>)[^<]*){0,30})</[aA]\s*>'
+PAGE_PATTERN = re.compile(f'{ANCHOR_PATTERN}|{EMAIL_DOMAIN_PATTERN}')
+ATTRIBUTE_PATTERN = re.compile(r'''([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''')
+TAG_PATTERN = re.compile(r'<[^>]*>')
+PLACEHOLDER_KEYWORDS = ['example', 'test', 'esimerkki', 'placeholder', 'sample']
+
+
+
+def email_at(text, match):
+    """The email whose '@domain' part is match (None without a local part)"""
+    start = match.start()
+    # Local-part characters before the '@', read back in growing windows
+    window = 64
+    while True:
+        run_start = LOCAL_RUN_PATTERN.search(text, max(0, start - window), start).start()
+        if run_start > start - window or run_start == 0:
+            break
+        window *= 4
+    local = LOCAL_START_PATTERN.search(text, run_start, start)
+    return text[local.start():start] + match.group() if local else None
+
+
+def iter_emails(text):
+    """(email, start, end) for every email in text"""
+    for match in AT_PATTERN.finditer(text):
+        email = email_at(text, match)
+        if email:
+            yield email, match.start() - len(email) + len(match.group()), match.end()
+
+# Links that are never worth fetching for an email
+SKIP_LINK_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.zip', '.mp4', '.mp3', '.doc', '.docx')
+
+class PathStats:
+    """How often each guessed contact page turned up an email, across runs"""
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.stats = {}     # page -> [hits, tries]
+        if filename and os.path.exists(filename):
+            try:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    self.stats = {page: list(counts) for page, counts in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read path stats from {filename}: {e}")
+
+    def rate(self, page):
+        hits, tries = self.stats.get(page, (0, 0))
+        # Laplace smoothing: unseen pages start at 0.5
+        return (hits + 1) / (tries + 2)
+
+    def ranked(self, pages):
+        """Best hit rate first; ties keep the given order"""
+        with self.lock:
+            return sorted(pages, key=lambda page: -self.rate(page))
+
+    def record(self, page, hit):
+        with self.lock:
+            counts = self.stats.setdefault(page, [0, 0])
+            counts[1] += 1
+            if hit:
+                counts[0] += 1
+
+    def save(self):
+        if not self.filename:
+            return
+        with self.lock:
+            try:
+                with open(self.filename, 'w', encoding='utf-8') as f:
+                    json.dump(self.stats, f, indent=2)
+            except OSError as e:
+                logger.warning(f"Could not save path stats to {self.filename}: {e}")
+
 class EmailExtractor:
-    def __init__(self, max_workers=5, timeout=10):
+    # Domains whose crawl is remembered at once; the oldest are forgotten beyond this
+    DOMAIN_MEMO_SIZE = 100000
+    
+    def __init__(self, max_workers=5, timeout=10, mode='thread', concurrency=200, per_host=2,
+                 probe_budget=8, path_stats=None, cache=None, max_page_bytes=MAX_PAGE_BYTES,
+                 host_delay=0.25, robots=False):
         """
         Initialize email extractor
         
         Args:
             max_workers: Number of concurrent threads for processing
             timeout: Request timeout in seconds
+            mode: 'thread' (thread pool) or 'async' (asyncio + aiohttp)
+            concurrency: Businesses in flight at once in async mode
+            per_host: Open connections per host in async mode
+            probe_budget: Contact pages probed (concurrently) per site after a homepage miss
+            path_stats: PathStats used to order the probes (in-memory if None)
+            cache: ResponseCache shared across runs (no caching if None)
+            max_page_bytes: Bytes read from any one page at most
+            host_delay: Seconds between two requests to the same website
+            robots: Honour robots.txt Crawl-delay (when longer than host_delay)
         """
         self.max_workers = max_workers
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
-        
-        # Improved email pattern - must not have file extensions before @
-        self.email_pattern = re.compile(
-            r'\b[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        )
+        self.mode = mode
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.probe_budget = probe_budget
+        self.path_stats = path_stats or PathStats()
+        self.cache = cache
+        self.max_page_bytes = max_page_bytes
+        # Website domain -> Future of its emails; chains share one crawl
+        self.domain_emails = {}
+        self.domain_lock = threading.Lock()
+        self.domain_reuses = 0
+        # Probes run beside the business workers, probe_budget per site
+        self.probe_executor = ThreadPoolExecutor(max_workers=max(1, max_workers * probe_budget),
+                                                 thread_name_prefix='probe')
+        # Requests to one website are spaced out; workers on other sites go on meanwhile
+        self.scheduler = HostScheduler(host_delay, robots, fetch=self.fetch_robots)
+        # One pool for the workers and their probes: a site's homepage and
+        # probe_budget contact pages may be in flight at once
+        self.http = HttpClient(workers=max_workers * (probe_budget + 1), per_host=probe_budget + 1,
+                               headers={'User-Agent': USER_AGENT}, scheduler=self.scheduler)
         
         # Pages where emails are commonly found (expanded list)
         self.contact_pages = [
@@ -74,22 +224,18 @@ class EmailExtractor:
             r'_\d+x\d+@',  # Dimension notation with @
             r'[0-9a-f]{8}-[0-9a-f]{4}-',  # UUID patterns before @
         ]
+        
+        # The lists above, each compiled into one pattern
+        self.false_positive_pattern = re.compile('|'.join(self.false_positive_patterns))
+        self.exclude_domain_pattern = re.compile('|'.join(map(re.escape, self.exclude_domains)))
+        self.placeholder_pattern = re.compile('|'.join(PLACEHOLDER_KEYWORDS))
     
     def is_valid_email(self, email):
         """Check if email is valid and not a false positive"""
         email_lower = email.lower()
         
         # Check for false positive patterns
-        for pattern in self.false_positive_patterns:
-            if re.search(pattern, email_lower):
-                return False
-        
-        # Check excluded domains
-        try:
-            email_domain = email_lower.split('@')[1]
-            if any(excluded in email_domain for excluded in self.exclude_domains):
-                return False
-        except IndexError:
+        if self.false_positive_pattern.search(email_lower):
             return False
         
         # Email should have at least 3 chars before @ and after @
@@ -97,41 +243,31 @@ class EmailExtractor:
         if len(parts) != 2 or len(parts[0]) < 3 or len(parts[1]) < 3:
             return False
         
+        # Check excluded domains
+        if self.exclude_domain_pattern.search(parts[1]):
+            return False
+        
         # Check if it looks like a real email (not placeholder)
-        placeholder_keywords = ['example', 'test', 'esimerkki', 'placeholder', 'sample']
-        if any(keyword in email_lower for keyword in placeholder_keywords):
+        if self.placeholder_pattern.search(email_lower):
             return False
         
         return True
     
+    def rank_emails(self, emails, website_domain):
+        """Unique emails, the website's own domain first, otherwise in page order"""
+        own = []
+        other = []
+        for email in dict.fromkeys(emails):
+            if website_domain and website_domain in email.split('@')[1]:
+                own.append(email)
+            else:
+                other.append(email)
+        return own + other
+    
     def extract_emails_from_text(self, text, website_domain):
         """Extract emails from text, filtering out non-business emails"""
-        emails = self.email_pattern.findall(text)
-        valid_emails = []
-        
-        for email in emails:
-            email = email.lower().strip()
-            
-            if not self.is_valid_email(email):
-                continue
-            
-            email_domain = email.split('@')[1]
-            
-            # Prefer emails matching the website domain
-            if website_domain and website_domain in email_domain:
-                valid_emails.insert(0, email)
-            else:
-                valid_emails.append(email)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_emails = []
-        for email in valid_emails:
-            if email not in seen:
-                seen.add(email)
-                unique_emails.append(email)
-        
-        return unique_emails
+        emails = [email.lower() for email, _, _ in iter_emails(text)]
+        return self.rank_emails([email for email in emails if self.is_valid_email(email)], website_domain)
     
     def get_domain_from_url(self, url):
         """Extract domain from URL"""
@@ -145,24 +281,189 @@ class EmailExtractor:
         except:
             return None
     
-    def fetch_page(self, url):
-        """Fetch page content with error handling"""
-        try:
-            response = self.session.get(url, timeout=self.timeout, allow_redirects=True)
-            response.raise_for_status()
-            return response.text
-        except requests.exceptions.Timeout:
-            logger.debug(f"Timeout fetching {url}")
-            return None
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                logger.debug(f"404 Not Found: {url}")
+    def fetch_page(self, url, stop=None, abandon=None):
+        """Fetch page content with error handling (served from the cache when fresh)"""
+        return self.http.fetch_text(url, self.timeout, self.cache, self.max_page_bytes, stop, abandon)
+    
+    def fetch_robots(self, url):
+        """robots.txt for the scheduler (not spaced itself, so it cannot wait on its own host)"""
+        return fetch_text(self.http.session(), url, self.timeout, self.cache, 64 * 1024)
+    
+    def email_found(self, domain):
+        """
+        Stop test for streamed pages
+        
+        True once the text has a usable mailto: address or an email at the
+        site's own domain; the rest of the page is not downloaded then.
+        """
+        site = (domain or '').split(':')[0]
+        
+        def found(text):
+            for email, start, end in iter_emails(text):
+                # An address at the very end may go on in the next chunk
+                if end == len(text):
+                    continue
+                email = email.lower()
+                is_mailto = text[max(0, start - 7):start].lower() == 'mailto:'
+                is_own = bool(site) and email.split('@')[1].endswith(site)
+                if (is_mailto or is_own) and self.is_valid_email(email):
+                    return True
+            return False
+        return found
+    
+    def parse_page(self, html_content, domain):
+        """
+        Emails in a page's text plus its mailto: links, and its (href, text) links
+        
+        One regex pass over the raw HTML; no DOM is built.
+        """
+        emails = []
+        links = []
+        for match in PAGE_PATTERN.finditer(html_content):
+            if match.group('domain'):
+                email = email_at(html_content, match)
+                if email:
+                    email = email.lower()
+                    if self.is_valid_email(email):
+                        emails.append(email)
+                continue
+            # An <a> tag: emails anywhere in it, then its href
+            for email, _, _ in iter_emails(match.group()):
+                email = email.lower()
+                if self.is_valid_email(email):
+                    emails.append(email)
+            attributes = {}
+            for name, double, single, bare in ATTRIBUTE_PATTERN.findall(match.group('attrs')):
+                attributes.setdefault(name.lower(), html.unescape(double or single or bare))
+            href = attributes.get('href')
+            if not href:
+                continue
+            if href.lower().startswith('mailto:'):
+                email = unquote(href[7:]).split('?')[0].lower().strip()
+                if self.is_valid_email(email):
+                    emails.append(email)
             else:
-                logger.debug(f"HTTP error {e.response.status_code}: {url}")
-            return None
-        except requests.exceptions.RequestException as e:
-            logger.debug(f"Error fetching {url}: {e}")
-            return None
+                text = ' '.join(html.unescape(TAG_PATTERN.sub(' ', match.group('text'))).split())
+                links.append((href, ' '.join(filter(None, [text, attributes.get('title'), attributes.get('aria-label')]))))
+        return self.rank_emails(emails, domain), links
+    
+    def scan_page(self, html_content, domain):
+        """Emails in a page's text plus its mailto: links"""
+        return self.parse_page(html_content, domain)[0]
+    
+    # --- NEW: Contact page discovery ---
+    @staticmethod
+    def page_key(url):
+        """Last path segment, the name hit rates are kept under"""
+        segments = [part for part in urlparse(url).path.lower().split('/') if part]
+        return unquote(segments[-1]) if segments else ''
+    
+    @staticmethod
+    def contact_score(path, text=''):
+        """How contact-like a link looks from its path and its text"""
+        path = unquote(path).lower().replace('_', '-')
+        text = text.lower()
+        path_score = max((weight for term, weight in CONTACT_TERMS.items() if term in path), default=0)
+        text_score = max((weight for term, weight in CONTACT_TERMS.items() if term in text), default=0)
+        if not path_score and not text_score:
+            return 0
+        # Deep pages (/blog/2019/05/contact-form-tips) are rarely the contact page
+        depth = len([part for part in path.split('/') if part])
+        return path_score + text_score - 0.5 * max(0, depth - 2)
+    
+    def rank_links(self, links, website_url):
+        """Same-site links ordered by contact-likeness, best probe_budget of them"""
+        domain = self.get_domain_from_url(website_url)
+        homepage = website_url.split('#')[0].rstrip('/')
+        scored = {}
+        for href, text in links:
+            if href.startswith(('tel:', 'javascript:', '#')):
+                continue
+            url = urljoin(website_url, href).split('#')[0]
+            parsed = urlparse(url)
+            if parsed.scheme not in ('http', 'https') or self.get_domain_from_url(url) != domain:
+                continue
+            if url.rstrip('/') == homepage or parsed.path.lower().endswith(SKIP_LINK_EXTENSIONS):
+                continue
+            score = self.contact_score(parsed.path, text)
+            if score > 0:
+                # Pages that often had emails before win ties
+                score *= 0.5 + self.path_stats.rate(self.page_key(url))
+                scored[url] = max(score, scored.get(url, 0))
+        ranked = sorted(scored, key=lambda url: -scored[url])[:self.probe_budget]
+        return [(self.page_key(url), url) for url in ranked]
+    
+    def sitemap_url(self, website_url):
+        parsed = urlparse(website_url)
+        return f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"
+    
+    def parse_sitemap(self, xml_content):
+        """Page URLs listed in a sitemap, as links without text"""
+        return [(unquote(url.strip()), '') for url in re.findall(r'<loc>\s*([^<]+?)\s*</loc>', xml_content)[:5000]]
+    
+    def guessed_pages(self, website_url):
+        """Blind guesses, for homepages with no usable links (e.g. built in JavaScript)"""
+        base_url = website_url.rstrip('/')
+        pages = self.path_stats.ranked(PAGES_TO_TRY)[:self.probe_budget]
+        return [(page, f"{base_url}/{page}") for page in pages]
+    
+    def contact_page_urls(self, website_url, links):
+        """(page, url) pairs to probe after a homepage miss, most promising first"""
+        candidates = self.rank_links(links, website_url)
+        if not candidates:
+            sitemap = self.fetch_page(self.sitemap_url(website_url))
+            if sitemap:
+                candidates = self.rank_links(self.parse_sitemap(sitemap), website_url)
+        return candidates or self.guessed_pages(website_url)
+    
+    async def contact_page_urls_async(self, session, website_url, links):
+        """Async twin of contact_page_urls"""
+        candidates = self.rank_links(links, website_url)
+        if not candidates:
+            sitemap = await self.fetch_page_async(session, self.sitemap_url(website_url))
+            if sitemap:
+                candidates = self.rank_links(self.parse_sitemap(sitemap), website_url)
+        return candidates or self.guessed_pages(website_url)
+    
+    def probe_contact_pages(self, candidates, domain):
+        """
+        Fetch the candidate contact pages of one site at the same time
+        
+        Returns the emails of the first page that has any; probes not yet
+        started are cancelled then, and probes still waiting for their turn
+        at the host give up.
+        """
+        stop = self.email_found(domain)
+        # Set once a probe hits, so probes still waiting for the host give up
+        abandon = threading.Event()
+        futures = {self.probe_executor.submit(self.fetch_page, url, stop, abandon): page
+                   for page, url in candidates}
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    html_content = future.result()
+                    emails = self.scan_page(html_content, domain) if html_content else []
+                    self.path_stats.record(futures[future], bool(emails))
+                    if emails:
+                        return emails
+        finally:
+            abandon.set()
+            for future in pending:
+                future.cancel()
+        return []
+    
+    def finish_emails(self, all_emails, domain):
+        """Remove duplicates and filter, logging the outcome"""
+        unique_emails = self.rank_emails(all_emails, domain)
+        
+        if unique_emails:
+            logger.info(f"Found {len(unique_emails)} email(s): {', '.join(unique_emails)}")
+        else:
+            logger.info("No emails found")
+        
+        return unique_emails
     
     def extract_emails_from_website(self, website_url):
         """
@@ -180,88 +481,216 @@ class EmailExtractor:
         logger.info(f"Extracting emails from: {website_url}")
         
         domain = self.get_domain_from_url(website_url)
-        all_emails = []
         
         # Try homepage first
-        html_content = self.fetch_page(website_url)
+        html_content = self.fetch_page(website_url, self.email_found(domain))
         
         if not html_content:
             logger.info("Could not fetch homepage")
             return []
         
-        # Extract emails from homepage
-        emails = self.extract_emails_from_text(html_content, domain)
-        all_emails.extend(emails)
-        
-        # Parse with BeautifulSoup for mailto links
-        soup = BeautifulSoup(html_content, 'html.parser')
-        for link in soup.find_all('a', href=True):
-            if link['href'].startswith('mailto:'):
-                email = link['href'].replace('mailto:', '').split('?')[0].lower().strip()
-                if self.is_valid_email(email):
-                    all_emails.append(email)
-        
         # If we found emails on homepage, return them
+        all_emails, links = self.parse_page(html_content, domain)
         if all_emails:
-            unique_emails = self.extract_emails_from_text(' '.join(all_emails), domain)
-            if unique_emails:
-                logger.info(f"Found {len(unique_emails)} email(s): {', '.join(unique_emails)}")
-                return unique_emails
+            return self.finish_emails(all_emails, domain)
         
-        # Otherwise, try contact pages (expanded search)
-        base_url = website_url.rstrip('/')
-        pages_to_try = [
-            'contact', 'contact-us', 'contactus',
-            'about', 'about-us', 'aboutus',
-            'privacy', 'privacy-policy',
-            'terms', 'legal',
-            'our-story', 'story',
-            'team', 'our-team',
-            'support', 'help',
-            'impressum', 'imprint',
-            'company'
-        ]
+        # Otherwise, try the homepage's most contact-like links
+        candidates = self.contact_page_urls(website_url, links)
+        all_emails = self.probe_contact_pages(candidates, domain)
+        return self.finish_emails(all_emails, domain)
+    
+    # --- NEW: one crawl per domain ---
+    def domain_key(self, website_url):
+        """Businesses whose websites share this key are crawled once"""
+        return (self.get_domain_from_url(website_url) or website_url).lower()
+    
+    def emails_for_website(self, website_url):
+        """
+        extract_emails_from_website, memoized by domain
         
-        for page in pages_to_try:
-            page_url = f"{base_url}/{page}"
-            
-            html_content = self.fetch_page(page_url)
-            if not html_content:
-                continue
-            
-            emails = self.extract_emails_from_text(html_content, domain)
-            all_emails.extend(emails)
-            
-            # Parse mailto links
-            soup = BeautifulSoup(html_content, 'html.parser')
-            for link in soup.find_all('a', href=True):
-                if link['href'].startswith('mailto:'):
-                    email = link['href'].replace('mailto:', '').split('?')[0].lower().strip()
-                    if self.is_valid_email(email):
-                        all_emails.append(email)
-            
-            # If we found emails, stop searching
-            if all_emails:
-                break
-            
-            # Small delay between requests
-            time.sleep(random.uniform(0.3, 0.8))
+        The first business with a domain crawls it; businesses with the same
+        domain (in flight or later) wait on that crawl's future instead.
+        """
+        key = self.domain_key(website_url)
+        with self.domain_lock:
+            future = self.domain_emails.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.remember_crawl(self.domain_emails, key, future)
+            else:
+                self.domain_reuses += 1
+        if owner:
+            try:
+                future.set_result(self.extract_emails_from_website(website_url))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            logger.info(f"Reusing the crawl of {key}")
+        return list(future.result())
+    
+    def remember_crawl(self, crawls, key, crawl):
+        """Keep a domain's crawl for later businesses, within DOMAIN_MEMO_SIZE"""
+        crawls[key] = crawl
+        if len(crawls) > self.DOMAIN_MEMO_SIZE:
+            crawls.pop(next(iter(crawls)))
+    
+    # --- NEW: asyncio engine ---
+    async def fetch_page_async(self, session, url, stop=None):
+        """Async twin of fetch_page"""
+        cache = self.cache
+        done, text, headers = lookup(cache, url)
+        if done:
+            return text
+        await self.scheduler.wait_async(url)
+        try:
+            async with session.get(url, allow_redirects=True, headers=headers) as response:
+                if response.status == 304 and cache:
+                    entry = cache.get(url)
+                    if entry:
+                        cache.note('revalidated')
+                        cache.refresh(url, response.headers)
+                        return entry.body
+                if cache:
+                    cache.note('miss')
+                    if response.status in ResponseCache.NEGATIVE_STATUSES:
+                        cache.store(url, response.status, None, response.headers)
+                if response.status >= 400:
+                    if response.status == 404:
+                        logger.debug(f"404 Not Found: {url}")
+                    else:
+                        logger.debug(f"HTTP error {response.status}: {url}")
+                    return None
+                content_type = response.headers.get('Content-Type', '')
+                if not is_text_content(content_type):
+                    logger.debug(f"Skipping {content_type}: {url}")
+                    return None
+                body = StreamedBody(response.charset, self.max_page_bytes, stop)
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    if not body.feed(chunk):
+                        break
+                text = body.text()
+                if body.truncated:
+                    logger.debug(f"Read only the first {self.max_page_bytes} bytes of {url}")
+                if cache and response.status == 200 and body.complete:
+                    cache.store(url, response.status, text, response.headers)
+                return text
+        except asyncio.TimeoutError:
+            logger.debug(f"Timeout fetching {url}")
+            return None
+        except (aiohttp.ClientError, UnicodeDecodeError) as e:
+            logger.debug(f"Error fetching {url}: {e}")
+            return None
+    
+    async def extract_emails_from_website_async(self, session, website_url):
+        """Async twin of extract_emails_from_website"""
+        if not website_url:
+            return []
         
-        # Remove duplicates and filter
-        unique_emails = self.extract_emails_from_text(' '.join(all_emails), domain)
+        logger.info(f"Extracting emails from: {website_url}")
         
-        if unique_emails:
-            logger.info(f"Found {len(unique_emails)} email(s): {', '.join(unique_emails)}")
-        else:
-            logger.info("No emails found")
+        domain = self.get_domain_from_url(website_url)
+        html_content = await self.fetch_page_async(session, website_url, self.email_found(domain))
         
-        return unique_emails
+        if not html_content:
+            logger.info("Could not fetch homepage")
+            return []
+        
+        all_emails, links = self.parse_page(html_content, domain)
+        if all_emails:
+            return self.finish_emails(all_emails, domain)
+        
+        candidates = await self.contact_page_urls_async(session, website_url, links)
+        all_emails = await self.probe_contact_pages_async(session, candidates, domain)
+        return self.finish_emails(all_emails, domain)
+    
+    async def probe_contact_pages_async(self, session, candidates, domain):
+        """Async twin of probe_contact_pages; the losing requests are aborted"""
+        stop = self.email_found(domain)
+        tasks = {asyncio.ensure_future(self.fetch_page_async(session, url, stop)): page for page, url in candidates}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    html_content = task.result()
+                    emails = self.scan_page(html_content, domain) if html_content else []
+                    self.path_stats.record(tasks[task], bool(emails))
+                    if emails:
+                        return emails
+        finally:
+            for task in pending:
+                task.cancel()
+        return []
+    
+    async def process_businesses_async(self, businesses):
+        """
+        Enrich businesses on one event loop
+        
+        A fixed number of worker tasks (concurrency) pull businesses from a
+        queue and share one connection pool, capped at per_host connections
+        per site, so throughput follows the network rather than thread count.
+        """
+        queue = asyncio.Queue()
+        for business in businesses:
+            queue.put_nowait(business)
+        updated_businesses = []
+        # Domain -> crawl task, awaited by every business on that domain
+        crawls = {}
+        
+        async with await self.open_session() as session:
+            async def worker():
+                while True:
+                    try:
+                        business = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    updated_businesses.append(await self.process_business_async(session, business, crawls))
+            
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(businesses)) or 1)))
+        
+        return updated_businesses
+    
+    async def open_session(self):
+        """aiohttp session over one connection pool (capped per host)"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+        # Connect/read timeouts like requests: time spent queued for one of the
+        # per_host connections must not count against a probe
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers={'User-Agent': USER_AGENT})
+    
+    async def process_business_async(self, session, business, crawls, limit=None):
+        """Async twin of process_single_business; crawls maps domains to crawl tasks"""
+        try:
+            if business.website:
+                logger.info(f"Processing #{business.id if business.id is not None else 'Unknown'}: {business.company or 'Unknown'}")
+                key = self.domain_key(business.website)
+                crawl = crawls.get(key)
+                if crawl is None:
+                    crawl = asyncio.ensure_future(self.crawl_async(session, business.website, limit))
+                    self.remember_crawl(crawls, key, crawl)
+                else:
+                    self.domain_reuses += 1
+                    logger.info(f"Reusing the crawl of {key}")
+                self.apply_emails(business, list(await crawl))
+        except Exception as e:
+            logger.error(f"Error processing {business.company}: {e}")
+        return business
+    
+    async def crawl_async(self, session, website_url, limit=None):
+        """extract_emails_from_website_async, at most limit (a Semaphore) at once"""
+        if limit is None:
+            return await self.extract_emails_from_website_async(session, website_url)
+        async with limit:
+            return await self.extract_emails_from_website_async(session, website_url)
     
     def process_single_business(self, business):
-        """Process a single business entry"""
-        business_id = business.get('id', 'Unknown')
-        business_name = business.get('name', 'Unknown')
-        website = business.get('website', '')
+        """Process a single business entry (a Business record or a row dict)"""
+        if isinstance(business, dict):
+            business = Business.from_row(business)
+        business_id = business.id if business.id is not None else 'Unknown'
+        business_name = business.company or 'Unknown'
+        website = business.website
         
         logger.info(f"Processing #{business_id}: {business_name}")
         
@@ -269,15 +698,20 @@ class EmailExtractor:
             logger.info(f"No website for {business_name}, skipping")
             return business
         
-        # Extract emails
-        emails = self.extract_emails_from_website(website)
-        
+        # Extract emails (once per domain)
+        self.apply_emails(business, self.emails_for_website(website))
+        return business
+    
+    def apply_emails(self, business, emails):
+        """Store the emails found for a business on its record"""
         # Add first email to business data (or empty string)
-        business['email'] = emails[0] if emails else ''
+        business.email = emails[0] if emails else ''
+        business.add_field('email')
         
         # Optionally store all found emails
         if len(emails) > 1:
-            business['all_emails'] = ', '.join(emails)
+            business.all_emails = ', '.join(emails)
+            business.add_field('all_emails')
         
         return business
     
@@ -286,14 +720,22 @@ class EmailExtractor:
         Process multiple businesses to extract emails
         
         Args:
-            businesses: List of business dictionaries
+            businesses: List of Business records (or row dictionaries)
             use_threading: Whether to use multi-threading
             
         Returns:
-            Updated list of businesses with emails
+            Updated list of Business records with emails
         """
+        businesses = [b if isinstance(b, Business) else Business.from_row(b) for b in businesses]
         updated_businesses = []
         
+        if self.mode == 'async':
+            if AIOHTTP_AVAILABLE:
+                logger.info(f"Processing {len(businesses)} businesses with asyncio "
+                            f"({self.concurrency} in flight, {self.per_host} per host)")
+                return asyncio.run(self.process_businesses_async(businesses))
+            logger.error("aiohttp not installed. Falling back to threads. Run: pip install aiohttp")
+        
         if use_threading:
             logger.info(f"Processing {len(businesses)} businesses with {self.max_workers} workers")
             
@@ -309,7 +751,7 @@ class EmailExtractor:
                         updated_businesses.append(result)
                     except Exception as e:
                         business = future_to_business[future]
-                        logger.error(f"Error processing {business.get('name')}: {e}")
+                        logger.error(f"Error processing {business.company}: {e}")
                         updated_businesses.append(business)
         else:
             # Sequential processing
@@ -329,13 +771,13 @@ class EmailExtractor:
             output_file: Output JSON file path (if None, overwrites input)
         """
         if output_file is None:
-            output_file = input_file.replace('.json', '_with_emails.json')
+            output_file = default_output_file(input_file)
         
         logger.info(f"Loading businesses from {input_file}")
         
         try:
             with open(input_file, 'r', encoding='utf-8') as f:
-                businesses = json.load(f)
+                businesses = [Business.from_row(row) for row in json.load(f)]
         except FileNotFoundError:
             logger.error(f"File not found: {input_file}")
             return
@@ -348,20 +790,54 @@ class EmailExtractor:
         # Process businesses
         updated_businesses = self.process_businesses(businesses)
         
-        # Sort by ID (convert to int if possible, otherwise keep as string)
-        try:
-            updated_businesses.sort(key=lambda x: int(x.get('id', 0)))
-        except (ValueError, TypeError):
-            updated_businesses.sort(key=lambda x: str(x.get('id', '')))
+        sort_by_id(updated_businesses)
         
         # Save results
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(updated_businesses, f, indent=2, ensure_ascii=False)
+            json.dump([b.to_row() for b in updated_businesses], f, indent=2, ensure_ascii=False)
         
         logger.info(f"Saved updated businesses to {output_file}")
         
         # Print statistics
-        businesses_with_emails = len([b for b in updated_businesses if b.get('email')])
+        businesses_with_emails = len([b for b in updated_businesses if b.email])
+        logger.info(f"Statistics: {businesses_with_emails}/{len(businesses)} businesses now have emails")
+        
+        return updated_businesses
+    
+    def process_jsonl_file(self, input_file, output_file=None):
+        """
+        Process businesses from a JSON Lines file (.jsonl, optionally .gz/.zst)
+        
+        Args:
+            input_file: Input JSONL file path
+            output_file: Output file path (same format and compression by default)
+        """
+        if output_file is None:
+            output_file = default_output_file(input_file)
+        
+        logger.info(f"Loading businesses from {input_file}")
+        
+        try:
+            businesses = [Business.from_row(row) for row in iter_jsonl(input_file)]
+        except FileNotFoundError:
+            logger.error(f"File not found: {input_file}")
+            return
+        except ValueError as e:
+            logger.error(f"Invalid JSON Lines file {input_file}: {e}")
+            return
+        
+        logger.info(f"Found {len(businesses)} businesses")
+        
+        # Process businesses
+        updated_businesses = self.process_businesses(businesses)
+        sort_by_id(updated_businesses)
+        
+        # Save results
+        write_jsonl(output_file, (b.to_row() for b in updated_businesses))
+        logger.info(f"Saved updated businesses to {output_file}")
+        
+        # Print statistics
+        businesses_with_emails = len([b for b in updated_businesses if b.email])
         logger.info(f"Statistics: {businesses_with_emails}/{len(businesses)} businesses now have emails")
         
         return updated_businesses
@@ -375,14 +851,14 @@ class EmailExtractor:
             output_file: Output CSV file path (if None, creates new file)
         """
         if output_file is None:
-            output_file = input_file.replace('.csv', '_with_emails.csv')
+            output_file = default_output_file(input_file)
         
         logger.info(f"Loading businesses from {input_file}")
         
         try:
             with open(input_file, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
-                businesses = list(reader)
+                businesses = [Business.from_row(row) for row in reader]
         except FileNotFoundError:
             logger.error(f"File not found: {input_file}")
             return
@@ -392,28 +868,155 @@ class EmailExtractor:
         # Process businesses
         updated_businesses = self.process_businesses(businesses)
         
-        # Sort by ID (convert to int if possible, otherwise keep as string)
-        try:
-            updated_businesses.sort(key=lambda x: int(x.get('id', 0)))
-        except (ValueError, TypeError):
-            updated_businesses.sort(key=lambda x: str(x.get('id', '')))
+        sort_by_id(updated_businesses)
         
         # Save results
         if updated_businesses:
-            fieldnames = list(updated_businesses[0].keys())
+            rows = [{k: export_text(v) for k, v in b.to_row().items()} for b in updated_businesses]
+            # 'email'/'all_emails' may only exist on some rows
+            fieldnames = list(dict.fromkeys(key for row in rows for key in row))
             
             with open(output_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
-                writer.writerows(updated_businesses)
+                writer.writerows(rows)
             
             logger.info(f"Saved updated businesses to {output_file}")
             
             # Print statistics
-            businesses_with_emails = len([b for b in updated_businesses if b.get('email')])
+            businesses_with_emails = len([b for b in updated_businesses if b.email])
             logger.info(f"Statistics: {businesses_with_emails}/{len(businesses)} businesses now have emails")
         
         return updated_businesses
+    
+    # --- NEW: Streaming mode for huge files ---
+    def process_file_streaming(self, input_file, output_file=None, window=1000):
+        """
+        Process a JSON, JSONL or CSV file of any size without loading it
+        
+        Rows are read one at a time, at most window businesses are in flight,
+        and results are written in input order as soon as they (and every row
+        before them) are done. Memory stays flat and the output file grows as
+        the run goes; unlike the other process_* methods, rows are not sorted
+        by id.
+        
+        Args:
+            input_file: Input file path (.json, .jsonl (.gz/.zst) or .csv)
+            output_file: Output file path (same format, '_with_emails' by default)
+            window: Businesses in flight (and buffered for reordering) at once
+        """
+        if output_file is None:
+            output_file = default_output_file(input_file)
+        
+        if not os.path.exists(input_file):
+            logger.error(f"File not found: {input_file}")
+            return
+        
+        logger.info(f"Streaming businesses from {input_file} ({window} in flight)")
+        stats = {'total': 0, 'emails': 0}
+        
+        def finished_rows(rows):
+            for business in self.stream_businesses(rows, window):
+                stats['total'] += 1
+                if business.email:
+                    stats['emails'] += 1
+                yield business.to_row()
+        
+        try:
+            if is_jsonl_file(input_file):
+                write_jsonl(output_file, finished_rows(iter_jsonl(input_file)))
+            elif input_file.endswith('.json'):
+                with JsonArrayWriter(output_file) as writer:
+                    for row in finished_rows(iter_json_array(input_file)):
+                        writer.write(row)
+            else:
+                with open(input_file, 'r', newline='', encoding='utf-8') as f_in, \
+                        open(output_file, 'w', newline='', encoding='utf-8') as f_out:
+                    reader = csv.DictReader(f_in)
+                    # Header is written up front, so the email columns are always there
+                    fieldnames = list(reader.fieldnames or [])
+                    fieldnames += [field for field in ('email', 'all_emails') if field not in fieldnames]
+                    writer = csv.DictWriter(f_out, fieldnames=fieldnames, restval='', extrasaction='ignore')
+                    writer.writeheader()
+                    for row in finished_rows(reader):
+                        writer.writerow({k: export_text(v) for k, v in row.items()})
+        except ValueError as e:
+            logger.error(f"Invalid input file {input_file} (stopped after {stats['total']} businesses): {e}")
+            return
+        
+        logger.info(f"Saved updated businesses to {output_file}")
+        logger.info(f"Statistics: {stats['emails']}/{stats['total']} businesses now have emails")
+        return stats
+    
+    def stream_businesses(self, rows, window):
+        """Yield the processed Business for each row, in input order, window at a time"""
+        businesses = (Business.from_row(row) for row in rows)
+        if self.mode == 'async':
+            if AIOHTTP_AVAILABLE:
+                return self.stream_with_asyncio(businesses, window)
+            logger.error("aiohttp not installed. Falling back to threads. Run: pip install aiohttp")
+        return self.stream_with_threads(businesses, window)
+    
+    def stream_with_threads(self, businesses, window):
+        # (business, future) in input order; the head is yielded once done
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for business in businesses:
+                    pending.append((business, executor.submit(self.process_single_business, business)))
+                    if len(pending) >= window:
+                        yield self.finished_business(*pending.popleft())
+                while pending:
+                    yield self.finished_business(*pending.popleft())
+            finally:
+                for _, future in pending:
+                    future.cancel()
+    
+    def finished_business(self, business, future):
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Error processing {business.company}: {e}")
+            return business
+    
+    def stream_with_asyncio(self, businesses, window):
+        # A private loop that only runs while the head of the window is awaited
+        loop = asyncio.new_event_loop()
+        pending = deque()
+        crawls = {}
+        session = None
+        try:
+            session = loop.run_until_complete(self.open_session())
+            limit = asyncio.Semaphore(self.concurrency)
+            for business in businesses:
+                pending.append(loop.create_task(self.process_business_async(session, business, crawls, limit)))
+                if len(pending) >= window:
+                    yield loop.run_until_complete(pending.popleft())
+            while pending:
+                yield loop.run_until_complete(pending.popleft())
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.wait(tasks))
+            if session is not None:
+                loop.run_until_complete(session.close())
+            loop.close()
+
+def default_output_file(input_file):
+    """input.json -> input_with_emails.json (compression suffixes are kept)"""
+    extension = next((ext for ext in sorted(JSONL_EXTENSIONS, key=len, reverse=True)
+                      if input_file.lower().endswith(ext)), os.path.splitext(input_file)[1])
+    stem = input_file[:len(input_file) - len(extension)]
+    return stem + '_with_emails' + input_file[len(stem):]
+
+def sort_by_id(businesses):
+    """Sort by ID (convert to int if possible, otherwise keep as string)"""
+    try:
+        businesses.sort(key=lambda x: int(x.id or 0))
+    except (ValueError, TypeError):
+        businesses.sort(key=lambda x: str(x.id or ''))
 
 def print_version():
     """Print version information"""
@@ -439,7 +1042,8 @@ USAGE:
 
 ARGUMENTS:
     INPUT_FILE              Input file containing business data
-                           Supported formats: .json, .csv
+                           Supported formats: .json, .jsonl, .csv
+                           (.jsonl may be gzip/zstd compressed: .jsonl.gz, .jsonl.zst)
 
 OPTIONS:
     -h, --help             Show this help message and exit
@@ -448,6 +1052,18 @@ OPTIONS:
     -w, --workers N        Number of concurrent workers (default: 5)
     -t, --timeout N        Request timeout in seconds (default: 10)
     --sequential           Process sequentially instead of using threads
+    --mode MODE            Fetch engine: thread (default) or async
+    --concurrency N        Async mode: businesses in flight at once (default: 200)
+    --per-host N           Async mode: connections per website (default: 2)
+    --probe-budget N       Contact pages probed at once per site (default: 8)
+    --path-stats FILE      Keep per-page hit rates in FILE; best pages are probed first
+    --cache FILE           Keep fetched pages in FILE (SQLite) and reuse them on re-runs
+    --cache-ttl HOURS      How long a cached page is used without asking again (default: 168)
+    --max-page-kb N        Read at most N KB of any page (default: 1024)
+    --host-delay SECONDS   Gap between two requests to the same website (default: 0.25)
+    --robots               Also honour robots.txt Crawl-delay
+    --stream               Read, process and write rows as they go (for huge files)
+    --window N             Stream mode: businesses in flight at once (default: 1000)
     --verbose              Enable verbose logging (DEBUG level)
     --quiet                Suppress INFO logs, show only warnings/errors
 
@@ -458,6 +1074,9 @@ INPUT FILE FORMAT:
             ...
           ]
     
+    JSONL: One object per line with a 'website' field
+          {{"id": 1, "name": "Company", "website": "https://example.com"}}
+    
     CSV:  Must have a 'website' column header
           id,name,website
           1,Company,https://example.com
@@ -479,6 +1098,15 @@ EXAMPLES:
     # Process sequentially (single-threaded)
     python email_extractor.py businesses.json --sequential
     
+    # asyncio engine: thousands of requests in flight on one thread
+    python email_extractor.py businesses.jsonl --mode async --concurrency 1000
+    
+    # Re-runs only download pages that changed or expired
+    python email_extractor.py businesses.jsonl --cache pages.db
+    
+    # Millions of rows: flat memory, output written as the run goes
+    python email_extractor.py businesses.jsonl.gz --stream --mode async
+    
     # Verbose mode for debugging
     python email_extractor.py businesses.json --verbose
 
@@ -492,14 +1120,23 @@ FEATURES:
     ✓ Supports both JSON and CSV formats
 
 NOTES:
-    - Respects website response times with random delays
+    - Probes a site's likely contact pages concurrently and stops at the first hit
+    - Businesses sharing a website domain (chains, franchises) are crawled once
+    - Pages are streamed: reading stops at the first mailto: or own-domain
+      email, at --max-page-kb, and non-text answers (PDFs, images) are skipped
+    - Requests to one website are spaced by --host-delay (and, with --robots,
+      its robots.txt Crawl-delay); other websites are fetched meanwhile
+    - With --stream, rows keep their input order (they are not sorted by id)
+      and a CSV output always has the 'email' and 'all_emails' columns
     - Uses proper User-Agent headers
     - Follows redirects automatically
     - Handles 404 and timeout errors gracefully
+    - With --cache, stale pages are revalidated (ETag / Last-Modified) and
+      404s are remembered for 30 days
     
 REQUIREMENTS:
     - requests
-    - beautifulsoup4
+    - aiohttp (optional, for --mode async)
 
 For issues and updates, visit: https://github.com/powergr/agms
 """
@@ -529,7 +1166,7 @@ For detailed help, use: %(prog)s --help-full
     )
     
     # Required arguments
-    parser.add_argument('input_file', nargs='?', help='Input file (JSON or CSV format)')
+    parser.add_argument('input_file', nargs='?', help='Input file (JSON, JSONL or CSV format)')
     
     # Optional arguments
     parser.add_argument('-h', '--help', action='store_true', help='Show brief help message')
@@ -542,6 +1179,30 @@ For detailed help, use: %(prog)s --help-full
                        help='Request timeout in seconds (default: 10)')
     parser.add_argument('--sequential', action='store_true',
                        help='Process sequentially instead of using threads')
+    parser.add_argument('--mode', choices=['thread', 'async'], default='thread',
+                       help='Fetch engine: thread pool or asyncio (needs aiohttp)')
+    parser.add_argument('--concurrency', type=int, default=200, metavar='N',
+                       help='Async mode: businesses in flight at once (default: 200)')
+    parser.add_argument('--per-host', type=int, default=2, metavar='N',
+                       help='Async mode: connections per website (default: 2)')
+    parser.add_argument('--probe-budget', type=int, default=8, metavar='N',
+                       help='Contact pages probed at once per site after a homepage miss (default: 8)')
+    parser.add_argument('--path-stats', metavar='FILE',
+                       help='Remember which contact pages find emails (JSON) to probe those first')
+    parser.add_argument('--cache', metavar='FILE',
+                       help='Cache fetched pages in FILE (SQLite) across runs')
+    parser.add_argument('--cache-ttl', type=float, default=168, metavar='HOURS',
+                       help='Hours a cached page is reused without revalidating (default: 168)')
+    parser.add_argument('--max-page-kb', type=int, default=MAX_PAGE_BYTES // 1024, metavar='N',
+                       help='Read at most N KB of any page (default: 1024)')
+    parser.add_argument('--host-delay', type=float, default=0.25, metavar='SECONDS',
+                       help='Seconds between two requests to the same website (default: 0.25)')
+    parser.add_argument('--robots', action='store_true',
+                       help="Honour the Crawl-delay of each website's robots.txt")
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream huge files: read, process and write rows as they go (input order)')
+    parser.add_argument('--window', type=int, default=1000, metavar='N',
+                       help='Businesses in flight in --stream mode (default: 1000)')
     parser.add_argument('--verbose', action='store_true',
                        help='Enable verbose logging (DEBUG level)')
     parser.add_argument('--quiet', action='store_true',
@@ -577,30 +1238,69 @@ For detailed help, use: %(prog)s --help-full
         logger.error("Number of workers must be at least 1")
         sys.exit(1)
     
-    if args.workers > 20:
+    if args.mode == 'thread' and args.workers > 20:
         logger.warning("High number of workers may cause rate limiting. Consider using 5-10.")
     
+    # Validate probe budget
+    if args.probe_budget < 1:
+        logger.error("Probe budget must be at least 1")
+        sys.exit(1)
+    
     # Validate timeout
     if args.timeout < 1:
         logger.error("Timeout must be at least 1 second")
         sys.exit(1)
     
+    # Validate host delay
+    if args.host_delay < 0:
+        logger.error("Host delay cannot be negative")
+        sys.exit(1)
+    
+    # Validate page size limit
+    if args.max_page_kb < 1:
+        logger.error("Page size limit must be at least 1 KB")
+        sys.exit(1)
+    
+    # Validate streaming window
+    if args.window < 1:
+        logger.error("Window must be at least 1")
+        sys.exit(1)
+    
     # Print startup info
     logger.info(f"Email Extractor v{__version__}")
-    logger.info(f"Configuration: {args.workers} workers, {args.timeout}s timeout")
+    if args.mode == 'async':
+        logger.info(f"Configuration: asyncio, {args.concurrency} in flight, {args.per_host} per host, {args.timeout}s timeout")
+    else:
+        logger.info(f"Configuration: {args.workers} workers, {args.timeout}s timeout")
+    
+    cache = ResponseCache(args.cache, ttl=args.cache_ttl * 3600) if args.cache else None
     
     # Create extractor
-    extractor = EmailExtractor(max_workers=args.workers, timeout=args.timeout)
+    extractor = EmailExtractor(max_workers=args.workers, timeout=args.timeout, mode=args.mode,
+                               concurrency=args.concurrency, per_host=args.per_host,
+                               probe_budget=args.probe_budget, path_stats=PathStats(args.path_stats),
+                               cache=cache, max_page_bytes=args.max_page_kb * 1024,
+                               host_delay=args.host_delay, robots=args.robots)
     
     # Determine file type and process
-    if args.input_file.endswith('.json'):
+    if args.stream and (is_jsonl_file(args.input_file) or args.input_file.endswith(('.json', '.csv'))):
+        extractor.process_file_streaming(args.input_file, args.output, window=args.window)
+    elif is_jsonl_file(args.input_file):
+        extractor.process_jsonl_file(args.input_file, args.output)
+    elif args.input_file.endswith('.json'):
         extractor.process_json_file(args.input_file, args.output)
     elif args.input_file.endswith('.csv'):
         extractor.process_csv_file(args.input_file, args.output)
     else:
-        logger.error("Input file must be .json or .csv")
+        logger.error("Input file must be .json, .jsonl (.gz/.zst) or .csv")
         sys.exit(1)
     
+    extractor.path_stats.save()
+    if extractor.domain_reuses:
+        logger.info(f"{extractor.domain_reuses} businesses shared a website with an earlier one (crawled once)")
+    if cache:
+        logger.info(f"Page cache: {cache.summary()}")
+        cache.close()
     print("\n✅ Email extraction completed!")
 
 if __name__ == "__main__":
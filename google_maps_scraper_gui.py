@@ -18,6 +18,7 @@ import logging
 import random
 import urllib.parse
 from datetime import datetime
+from business import export_text
 
 __version__ = "1.2.0"
 
@@ -477,7 +478,7 @@ class GoogleMapsScraperGUI:
                 try:
                     businesses = scraper.search_google_maps(self.query_var.get(), city)
                     for business in businesses:
-                        business['city'] = city
+                        business.city = city
                         results.append(business)
                     
                     self.logger.info(f"Found {len(businesses)} businesses in {city}")
@@ -536,25 +537,12 @@ class GoogleMapsScraperGUI:
             fieldnames = ['id', 'name', 'description', 'rating', 'reviewCount', 'phone', 'email', 'website', 'address', 'image', 'verified', 'tags']
             
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
                 
                 for idx, result in enumerate(results, 1):
-                    row = {
-                        'id': idx,
-                        'name': result.get('company', ''),
-                        'description': '',  # Not available from Google Maps
-                        'rating': result.get('rating', ''),
-                        'reviewCount': result.get('reviews', ''),
-                        'phone': result.get('phone', ''),
-                        'email': result.get('email', ''),
-                        'website': result.get('website', ''),
-                        'address': result.get('address', ''),
-                        'image': '',  # Not available from Google Maps
-                        'verified': 'true' if result.get('rating') else 'false',
-                        'tags': ''  # Not available from Google Maps
-                    }
-                    writer.writerow(row)
+                    row = result.to_row(idx, fieldnames)
+                    writer.writerow([export_text(row[field]) for field in fieldnames])
                     
             self.logger.info(f"Results saved to {filename}")
         except Exception as e:
@@ -566,21 +554,12 @@ class GoogleMapsScraperGUI:
             filename = f"{output}.json"
             formatted_results = []
             
+            fieldnames = ['id', 'name', 'description', 'rating', 'reviewCount', 'phone', 'email', 'website', 'address', 'image', 'verified', 'tags']
             for idx, result in enumerate(results, 1):
-                formatted_result = {
-                    'id': idx,
-                    'name': result.get('company', ''),
-                    'description': '',  # Not available from Google Maps
-                    'rating': float(result.get('rating', 0)) if result.get('rating') else 0,
-                    'reviewCount': int(result.get('reviews', 0)) if result.get('reviews') else 0,
-                    'phone': result.get('phone', ''),
-                    'email': result.get('email', ''),
-                    'website': result.get('website', ''),
-                    'address': result.get('address', ''),
-                    'image': '',  # Not available from Google Maps
-                    'verified': bool(result.get('rating')),
-                    'tags': []  # Not available from Google Maps
-                }
+                formatted_result = result.to_row(idx, fieldnames)
+                formatted_result['rating'] = result.rating or 0
+                formatted_result['reviewCount'] = result.reviews or 0
+                formatted_result['tags'] = []  # Not available from Google Maps
                 formatted_results.append(formatted_result)
                 
             with open(filename, 'w', encoding='utf-8') as jsonfile:
@@ -596,13 +575,13 @@ class GoogleMapsScraperGUI:
         self.logger.info("Scraping Results")
         self.logger.info(f"{'='*60}")
         self.logger.info(f"📊 Total companies found: {len(results)}")
-        self.logger.info(f"🏙️  Cities processed: {len(set(r['city'] for r in results))}")
+        self.logger.info(f"🏙️  Cities processed: {len(set(r.city for r in results))}")
         
-        with_ratings = len([r for r in results if r['rating']])
-        with_reviews = len([r for r in results if r['reviews']])
-        with_websites = len([r for r in results if r['website']])
-        with_phones = len([r for r in results if r['phone']])
-        with_addresses = len([r for r in results if r['address']])
+        with_ratings = len([r for r in results if r.rating is not None])
+        with_reviews = len([r for r in results if r.reviews is not None])
+        with_websites = len([r for r in results if r.website])
+        with_phones = len([r for r in results if r.phone])
+        with_addresses = len([r for r in results if r.address])
         
         self.logger.info(f"⭐ Companies with ratings: {with_ratings} ({with_ratings/len(results)*100:.1f}%)")
         self.logger.info(f"💬 Companies with reviews: {with_reviews} ({with_reviews/len(results)*100:.1f}%)")
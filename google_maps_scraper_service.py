@@ -0,0 +1,433 @@
+"""
+Google Maps Scraper Service - keep browsers warm and accept jobs over HTTP
+
+Runs a pool of GoogleMapsScraper workers that stay alive between jobs, so
+Chrome startup, driver resolution and cookie consent are paid once.
+Jobs are query x city lists submitted to a small local JSON API.
+
+Endpoints:
+    POST   /jobs               {"query": "...", "cities": [...], "output": "name"}
+                               ("queries": [...] runs every query over every city;
+                               "output" is a plain file name, saved under --output-dir)
+    GET    /jobs               List jobs and their progress
+    GET    /jobs/<id>          Job status (add ?results=1 to include results)
+    GET    /jobs/<id>/stream   Results as JSON Lines, streamed while the job runs
+    DELETE /jobs/<id>          Forget a finished job and its results
+    GET    /status             Queue depth, busy workers, proxy health
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from business import dumps_json
+from http_client import HttpClient, ResponseCache
+from google_maps_scraper import (GoogleMapsScraper, ProxyPool, RateController, merge_query_matches,
+                                 save_results, __version__)
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeJob:
+    """Queries over a list of cities, split into one task per query and city"""
+
+    def __init__(self, queries, cities, output=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.queries = queries
+        self.cities = cities
+        self.output = output
+        self.results = []
+        self.errors = []
+        self.done_tasks = 0
+        self.created = time.time()
+        self.finished = None
+        self.condition = threading.Condition()
+
+    @property
+    def total_tasks(self):
+        return len(self.queries) * len(self.cities)
+
+    @property
+    def is_done(self):
+        return self.done_tasks >= self.total_tasks
+
+    def add_results(self, query, city, businesses, error=None):
+        """Record one finished task. True only for the call that completes the job."""
+        with self.condition:
+            self.results.extend(businesses)
+            if error:
+                self.errors.append({'query': query, 'city': city, 'error': error})
+            self.done_tasks += 1
+            completed = self.done_tasks == self.total_tasks
+            if completed:
+                self.finished = time.time()
+            self.condition.notify_all()
+            return completed
+
+    def to_dict(self, include_results=False):
+        with self.condition:
+            data = {
+                'id': self.id,
+                'query': '; '.join(self.queries),
+                'cities': len(self.cities),
+                'tasks': self.total_tasks,
+                'completed': self.done_tasks,
+                'results': len(self.results),
+                'errors': self.errors,
+                'status': 'done' if self.is_done else 'running',
+                'created': self.created,
+                'finished': self.finished
+            }
+            if include_results:
+                data['items'] = [business.to_row() for business in self.results]
+            return data
+
+
+class ScraperService:
+    """Worker pool of warm browsers fed from a shared task queue"""
+
+    def __init__(self, args, proxy_pool=None, rate_controller=None, http_cache=None):
+        self.args = args
+        self.proxy_pool = proxy_pool
+        self.rate_controller = rate_controller
+        self.http_cache = http_cache
+        # One keep-alive pool for every warm browser's website requests
+        self.http = HttpClient(workers=args.workers, per_host=args.workers,
+                               headers=GoogleMapsScraper.WEBSITE_HEADERS)
+        self.tasks = queue.Queue()
+        self.jobs = {}
+        self.jobs_lock = threading.Lock()
+        self.busy = 0
+        self.busy_lock = threading.Lock()
+        self.running = True
+        self.threads = []
+
+    def start(self):
+        for i in range(self.args.workers):
+            thread = threading.Thread(target=self.worker_loop, args=(i,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        self.running = False
+        for _ in self.threads:
+            self.tasks.put(None)
+        for thread in self.threads:
+            thread.join(timeout=30)
+        self.http.close()
+
+    def new_scraper(self):
+        return GoogleMapsScraper(headless=self.args.headless, proxy=self.args.proxy,
+                                 proxy_pool=self.proxy_pool, profile_root=self.args.profile_dir,
+                                 recycle_mb=self.args.recycle_mb, recycle_pages=self.args.recycle_pages,
+                                 rate_controller=self.rate_controller, http_cache=self.http_cache,
+                                 http_client=self.http)
+
+    def worker_loop(self, worker_id):
+        scraper = None
+        while self.running:
+            # Launch (or relaunch) the browser before waiting for work, so it is warm
+            if scraper is None:
+                try:
+                    scraper = self.new_scraper()
+                    logger.info(f"Worker {worker_id}: browser ready")
+                except Exception as e:
+                    logger.error(f"Worker {worker_id}: could not start browser: {e}")
+                    time.sleep(10)
+                    continue
+
+            task = self.tasks.get()
+            if task is None:
+                break
+            job, query, city = task
+
+            with self.busy_lock:
+                self.busy += 1
+            completed = False
+            try:
+                businesses = scraper.search_google_maps(query, city)
+                for business in businesses:
+                    business.city = city
+                    business.query = query
+                completed = job.add_results(query, city, businesses)
+                logger.info(f"Worker {worker_id}: {len(businesses)} businesses for '{query}' in {city}")
+            except Exception as e:
+                logger.error(f"Worker {worker_id}: error on '{query}' in {city}: {e}")
+                completed = job.add_results(query, city, [], error=str(e))
+                # The browser may be in a bad state - start a fresh one
+                try:
+                    scraper.close()
+                except Exception:
+                    pass
+                scraper = None
+            finally:
+                with self.busy_lock:
+                    self.busy -= 1
+                self.tasks.task_done()
+
+            # Only the worker that finished the last task saves the job
+            if completed:
+                self.finish_job(job)
+
+        if scraper:
+            scraper.close()
+
+    def finish_job(self, job):
+        """Push a completed job into the configured sinks"""
+        if not job.results:
+            return
+        results = merge_query_matches(job.results) if len(job.queries) > 1 else job.results
+        try:
+            if job.output:
+                save_results(results, self.args, output=os.path.join(self.args.output_dir, job.output))
+            else:
+                # No file name given - only feed the database sinks
+                exporter = GoogleMapsScraper.for_export(results)
+                if self.args.sqlite:
+                    exporter.save_to_sqlite(self.args.sqlite)
+                if self.args.postgres:
+                    exporter.save_to_postgres(self.args.postgres)
+        except Exception as e:
+            logger.error(f"Could not save results for job {job.id}: {e}")
+
+    def submit(self, queries, cities, output=None):
+        job = ScrapeJob(queries, cities, output)
+        with self.jobs_lock:
+            self.jobs[job.id] = job
+        for query in queries:
+            for city in cities:
+                self.tasks.put((job, query, city))
+        logger.info(f"Job {job.id} queued: {', '.join(queries)} in {len(cities)} cities")
+        return job
+
+    def get_job(self, job_id):
+        with self.jobs_lock:
+            return self.jobs.get(job_id)
+
+    def remove_job(self, job_id):
+        with self.jobs_lock:
+            job = self.jobs.get(job_id)
+            if job and job.is_done:
+                del self.jobs[job_id]
+                return True
+        return False
+
+    def status(self):
+        with self.jobs_lock:
+            jobs = list(self.jobs.values())
+        data = {
+            'version': __version__,
+            'workers': self.args.workers,
+            'busy_workers': self.busy,
+            'queue_depth': self.tasks.qsize(),
+            'jobs_running': len([j for j in jobs if not j.is_done]),
+            'jobs_total': len(jobs)
+        }
+        if self.proxy_pool:
+            data['proxies_healthy'] = self.proxy_pool.healthy_count()
+            data['proxies_total'] = len(self.proxy_pool)
+        if self.rate_controller:
+            data['rate_control'] = self.rate_controller.summary()
+            data['cooling_down'] = self.rate_controller.cooling_down
+        if self.http_cache:
+            data['website_cache'] = self.http_cache.summary()
+        return data
+
+
+def make_handler(service):
+    class ServiceHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            logger.debug(f"{self.address_string()} - {format % args}")
+
+        def send_json(self, data, status=200):
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def parts(self):
+            parsed = urlparse(self.path)
+            return [p for p in parsed.path.split('/') if p], parse_qs(parsed.query)
+
+        def do_GET(self):
+            parts, params = self.parts()
+            if parts == ['status']:
+                return self.send_json(service.status())
+            if parts == ['jobs']:
+                with service.jobs_lock:
+                    jobs = list(service.jobs.values())
+                return self.send_json([job.to_dict() for job in jobs])
+            if len(parts) >= 2 and parts[0] == 'jobs':
+                job = service.get_job(parts[1])
+                if not job:
+                    return self.send_json({'error': 'job not found'}, 404)
+                if len(parts) == 3 and parts[2] == 'stream':
+                    return self.stream(job)
+                include = params.get('results', ['0'])[0] in ('1', 'true')
+                return self.send_json(job.to_dict(include_results=include))
+            self.send_json({'error': 'not found'}, 404)
+
+        def stream(self, job):
+            """Send results as JSON Lines as soon as each city finishes"""
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.end_headers()
+            sent = 0
+            try:
+                while True:
+                    with job.condition:
+                        while sent == len(job.results) and not job.is_done:
+                            job.condition.wait(timeout=30)
+                        batch = job.results[sent:]
+                        done = job.is_done
+                    for business in batch:
+                        self.wfile.write((dumps_json(business.to_row()) + '\n').encode('utf-8'))
+                    sent += len(batch)
+                    self.wfile.flush()
+                    if done and sent == len(job.results):
+                        break
+            except (BrokenPipeError, ConnectionResetError):
+                logger.debug(f"Stream client for job {job.id} disconnected")
+
+        def do_POST(self):
+            parts, _ = self.parts()
+            if parts != ['jobs']:
+                return self.send_json({'error': 'not found'}, 404)
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+            except (ValueError, json.JSONDecodeError):
+                return self.send_json({'error': 'invalid JSON body'}, 400)
+            if not isinstance(payload, dict):
+                return self.send_json({'error': 'the JSON body must be an object'}, 400)
+
+            queries = text_list(payload.get('queries') or payload.get('query'))
+            cities = text_list(payload.get('cities') or payload.get('city'))
+            if queries is None or cities is None:
+                return self.send_json({'error': "'queries' and 'cities' must be a string or a list of strings"}, 400)
+            if not queries or not cities:
+                return self.send_json({'error': "'query' (or 'queries') and 'cities' are required"}, 400)
+
+            output = payload.get('output')
+            if output is not None and not is_plain_file_name(output):
+                return self.send_json({'error': "'output' must be a plain file name (no folders)"}, 400)
+
+            job = service.submit(queries, cities, output)
+            self.send_json(job.to_dict(), 202)
+
+        def do_DELETE(self):
+            parts, _ = self.parts()
+            if len(parts) == 2 and parts[0] == 'jobs':
+                if service.remove_job(parts[1]):
+                    return self.send_json({'deleted': parts[1]})
+                return self.send_json({'error': 'job not found or still running'}, 409)
+            self.send_json({'error': 'not found'}, 404)
+
+    return ServiceHandler
+
+
+def text_list(value):
+    """A string or list of strings as a list of unique stripped strings (None if neither)"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return None
+    return list(dict.fromkeys(v.strip() for v in value if isinstance(v, str) and v.strip()))
+
+
+def is_plain_file_name(name):
+    """True for a bare file name that cannot point outside the output folder"""
+    return (isinstance(name, str) and name.strip() == name and name not in ('', '.', '..')
+            and not any(sep in name for sep in ('/', '\\', ':', '\0')))
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Run the Google Maps Scraper as a local service with warm browsers',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  python %(prog)s --workers 3 --headless
+  python %(prog)s --port 9000 --proxy-file proxies.txt --sqlite results.db
+
+  curl -X POST localhost:8765/jobs -d '{"query": "gyms", "cities": ["Berlin, Germany"]}'
+  curl -X POST localhost:8765/jobs -d '{"queries": ["dentists", "gyms"], "cities": ["Paris, France"]}'
+  curl localhost:8765/jobs/<id>/stream
+        '''
+    )
+    parser.add_argument('-v', '--version', action='version', version=f'%(prog)s {__version__}')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('--workers', type=int, default=2, help='Number of warm browsers')
+    parser.add_argument('--headless', action='store_true', help='Run browsers in headless mode')
+    parser.add_argument('--format', nargs='+', choices=['csv', 'json', 'jsonl', 'excel', 'parquet', 'arrow', 'both'], default=['both'], help='Output format for saved jobs')
+    parser.add_argument('--compress', choices=['gzip', 'zstd'], help='Compress JSON Lines output (.jsonl.gz / .jsonl.zst)')
+    parser.add_argument('--excel-sheet-per-city', action='store_true', help='Excel export: one worksheet per city')
+    parser.add_argument('--proxy', type=str, help='Proxy server in format http://ip:port')
+    parser.add_argument('--proxy-file', type=str, help='File with one proxy per line')
+    parser.add_argument('--proxy-cooldown', type=int, default=300, help='Seconds a throttled proxy is rested before reuse')
+    parser.add_argument('--profile-dir', type=str, help='Keep persistent Chrome profiles under this folder')
+    parser.add_argument('--recycle-mb', type=int, default=GoogleMapsScraper.RECYCLE_MB, help='Restart a browser using more than this many MB (needs psutil, 0 = off)')
+    parser.add_argument('--recycle-pages', type=int, default=GoogleMapsScraper.RECYCLE_PAGES, help='Restart a browser after this many pages (0 = off)')
+    parser.add_argument('--rate-control', choices=['adaptive', 'off'], default='adaptive', help='Slow all workers down together when Google starts blocking')
+    parser.add_argument('--block-cooldown', type=int, default=60, help='Seconds every worker pauses after the first block (doubles on repeats)')
+    parser.add_argument('--http-cache', type=str, help='Cache company website pages in this SQLite file (email scanning)')
+    parser.add_argument('--output-dir', type=str, default='.', help='Folder for the files of jobs submitted with an "output" name')
+    parser.add_argument('--sqlite', type=str, help='Also save every finished job to this SQLite DB')
+    parser.add_argument('--postgres', type=str, help='Also save every finished job to this Postgres DB')
+    parser.add_argument('--verbose', action='store_true', help='Verbose output')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if args.workers < 1:
+        print("Error: --workers must be at least 1")
+        sys.exit(1)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    proxy_pool = None
+    if args.proxy_file:
+        proxy_pool = ProxyPool.from_file(args.proxy_file, cooldown=args.proxy_cooldown)
+        if not len(proxy_pool):
+            print(f"Error: No proxies loaded from {args.proxy_file}")
+            sys.exit(1)
+
+    rate_controller = RateController(args.workers, cooldown=args.block_cooldown) if args.rate_control == 'adaptive' else None
+    http_cache = ResponseCache(args.http_cache) if args.http_cache else None
+    service = ScraperService(args, proxy_pool, rate_controller, http_cache)
+    service.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Google Maps Scraper Service v{__version__}")
+    print(f"Listening on http://{args.host}:{args.port} with {args.workers} workers (Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⚠️  Shutting down...")
+    finally:
+        server.server_close()
+        service.stop()
+        print("Done!")
+
+
+if __name__ == "__main__":
+    main()
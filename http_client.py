@@ -0,0 +1,406 @@
+"""
+Shared HTTP layer for the scraper and the email extractor
+
+Both tools fetch company websites. Everything they have in common about
+doing that lives here: the connection pool, the per-host politeness
+scheduler, the on-disk response cache and the streamed, size-capped text
+fetch that uses them.
+"""
+
+import asyncio
+import codecs
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import Future
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Pages are read in chunks, and never past this many bytes
+MAX_PAGE_BYTES = 1024 * 1024
+CHUNK_SIZE = 16 * 1024
+# Text carried over between chunks, so a match split by a chunk edge is still seen
+SCAN_OVERLAP = 256
+
+CacheEntry = namedtuple('CacheEntry', 'status body etag last_modified expires_at')
+
+
+class ResponseCache:
+    """
+    On-disk cache of fetched pages, keyed by URL
+
+    Entries younger than their TTL are served without a request. Stale
+    entries are revalidated with If-None-Match / If-Modified-Since, so an
+    unchanged page costs a 304 instead of a download. 404 and 410 answers
+    are stored as negative entries, so dead URLs are not asked for again.
+    """
+
+    NEGATIVE_STATUSES = (404, 410)
+
+    def __init__(self, filename, ttl=7 * 86400, negative_ttl=30 * 86400):
+        self.filename = filename
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(filename, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                expires_at REAL
+            )
+        """)
+        self.conn.commit()
+        self.counts = {'hit': 0, 'revalidated': 0, 'miss': 0}
+
+    def get(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status, body, etag, last_modified, expires_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        status, body, etag, last_modified, expires_at = row
+        text = zlib.decompress(body).decode('utf-8') if body else None
+        return CacheEntry(status, text, etag, last_modified, expires_at)
+
+    @staticmethod
+    def is_fresh(entry):
+        return entry.expires_at > time.time()
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for a stale entry"""
+        headers = {}
+        if entry and entry.status == 200:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def lifetime(self, status, headers):
+        """Seconds an answer stays fresh, or None when it must not be stored"""
+        if status in self.NEGATIVE_STATUSES:
+            return self.negative_ttl
+        cache_control = (headers.get('Cache-Control') or '').lower()
+        if 'no-store' in cache_control:
+            return None
+        max_age = re.search(r'max-age=(\d+)', cache_control)
+        if max_age:
+            return min(int(max_age.group(1)), self.ttl)
+        if 'no-cache' in cache_control:
+            return 0
+        return self.ttl
+
+    def store(self, url, status, text, headers):
+        lifetime = self.lifetime(status, headers)
+        if lifetime is None:
+            return
+        now = time.time()
+        body = zlib.compress(text.encode('utf-8')) if text else None
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (url, status, body, etag, last_modified, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, status, body, headers.get('ETag'), headers.get('Last-Modified'), now, now + lifetime)
+            )
+            self.conn.commit()
+
+    def refresh(self, url, headers):
+        """A 304 answer: the cached body is still good for another lifetime"""
+        lifetime = self.lifetime(200, headers)
+        now = time.time()
+        with self.lock:
+            self.conn.execute("UPDATE responses SET fetched_at = ?, expires_at = ? WHERE url = ?",
+                              (now, now + (lifetime or 0), url))
+            self.conn.commit()
+
+    def note(self, kind):
+        with self.lock:
+            self.counts[kind] += 1
+
+    def summary(self):
+        return (f"{self.counts['hit']} served from cache, {self.counts['revalidated']} revalidated (304), "
+                f"{self.counts['miss']} downloaded")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def is_text_content(content_type):
+    """HTML, XML and plain text are worth reading; PDFs, images and other binaries are not"""
+    if not content_type:
+        return True
+    content_type = content_type.split(';')[0].strip().lower()
+    return content_type.startswith('text/') or 'html' in content_type or 'xml' in content_type
+
+
+class StreamedBody:
+    """
+    A response body decoded chunk by chunk
+
+    feed() returns False once reading further is pointless: the byte cap is
+    reached, or stop(text) is true for the newest text (plus SCAN_OVERLAP
+    characters before it).
+    """
+
+    def __init__(self, encoding, max_bytes=MAX_PAGE_BYTES, stop=None):
+        try:
+            self.decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.max_bytes = max_bytes
+        self.stop = stop
+        self.parts = []
+        self.size = 0
+        self.tail = ''
+        self.truncated = False
+        self.stopped = False
+
+    def feed(self, chunk):
+        if self.max_bytes and self.size + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.size]
+            self.truncated = True
+        self.size += len(chunk)
+        text = self.decoder.decode(chunk)
+        self.parts.append(text)
+        if self.truncated:
+            return False
+        if self.stop:
+            window = self.tail + text
+            if self.stop(window):
+                self.stopped = True
+                return False
+            self.tail = window[-SCAN_OVERLAP:]
+        return True
+
+    @property
+    def complete(self):
+        """The whole body was read (only complete bodies may be cached)"""
+        return not (self.truncated or self.stopped)
+
+    def text(self):
+        return ''.join(self.parts) + self.decoder.decode(b'', final=True)
+
+
+class HostScheduler:
+    """
+    Per-host politeness: requests to one host are spaced at least delay apart
+
+    Every host has a next-allowed time. A request books the next free slot
+    of its own host and waits only for that, so work on other hosts goes on
+    meanwhile. With robots=True a larger Crawl-delay from the host's
+    robots.txt (fetched once per host) is used instead, up to max_delay.
+
+    Args:
+        delay: Seconds between two requests to the same host (0 = no spacing)
+        robots: Honour robots.txt Crawl-delay
+        fetch: url -> text or None, used to read robots.txt
+        max_delay: Longest gap any robots.txt can ask for
+    """
+
+    def __init__(self, delay=0.25, robots=False, fetch=None, max_delay=30):
+        self.delay = delay
+        self.robots = robots and fetch is not None
+        self.fetch = fetch
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.next_allowed = {}
+        # Host -> Future of its RobotFileParser (None when there is no robots.txt)
+        self.robots_files = {}
+
+    def robots_file(self, url):
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        with self.lock:
+            future = self.robots_files.get(host)
+            owner = future is None
+            if owner:
+                future = self.robots_files[host] = Future()
+        if owner:
+            parser = None
+            try:
+                text = self.fetch(f"{parsed.scheme}://{host}/robots.txt")
+                if text:
+                    parser = RobotFileParser()
+                    parser.parse(text.splitlines())
+            except Exception as e:
+                logger.debug(f"Could not read robots.txt of {host}: {e}")
+            future.set_result(parser)
+        return future.result()
+
+    def gap(self, url):
+        """Seconds between requests to the host of url"""
+        if not self.robots:
+            return self.delay
+        parser = self.robots_file(url)
+        crawl_delay = parser.crawl_delay('*') if parser else None
+        return max(self.delay, min(float(crawl_delay or 0), self.max_delay))
+
+    def reserve(self, url):
+        """Book the next free slot of the host; seconds until it starts"""
+        gap = self.gap(url)
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_allowed.get(host, 0))
+            self.next_allowed[host] = start + gap
+        return start - now
+
+    def wait(self, url, abandon=None):
+        """Wait for the host's slot; False when abandon (an Event) was set meanwhile"""
+        delay = self.reserve(url)
+        if abandon is not None:
+            return not abandon.wait(delay)
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    async def wait_async(self, url):
+        """Async twin of wait; robots.txt is read on a worker thread"""
+        if self.robots:
+            await asyncio.get_running_loop().run_in_executor(None, self.robots_file, url)
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HttpClient:
+    """
+    Thread-safe HTTP client over one shared, right-sized connection pool
+
+    requests.Session keeps cookies and headers that are not safe to share
+    between threads, so every thread gets its own Session. All of them mount
+    the same HTTPAdapter, whose urllib3 pools are thread-safe: a keep-alive
+    connection opened by one thread is reused by the next, and TLS
+    handshakes are paid once per host rather than once per request.
+
+    Args:
+        workers: Threads that use the client (number of hosts kept pooled)
+        per_host: Connections kept open to any one host
+        retries: Retries on connection errors, 429 and 5xx answers
+        backoff: Retry backoff factor in seconds (0.5 -> 0.5s, 1s, 2s ...)
+        headers: Default headers for every request
+        scheduler: HostScheduler that spaces requests per host (none if None)
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, workers=10, per_host=2, retries=2, backoff=0.5, headers=None, scheduler=None):
+        # Timeouts are not retried: a slow site would cost several timeouts
+        retry = Retry(total=retries, connect=min(retries, 1), read=0, backoff_factor=backoff,
+                      status_forcelist=self.RETRY_STATUSES, allowed_methods=('GET', 'HEAD'),
+                      raise_on_status=False,
+                      # A site asking for minutes would stall the worker; back off instead
+                      respect_retry_after_header=False)
+        self.adapter = HTTPAdapter(pool_connections=max(10, workers), pool_maxsize=max(1, per_host),
+                                   max_retries=retry)
+        self.headers = headers or {}
+        self.scheduler = scheduler
+        self.local = threading.local()
+
+    def session(self):
+        """This thread's Session (created on first use)"""
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+        return session
+
+    def fetch_text(self, url, timeout, cache=None, max_bytes=MAX_PAGE_BYTES, stop=None, abandon=None):
+        return fetch_text(self.session(), url, timeout, cache, max_bytes, stop, self.scheduler, abandon)
+
+    def close(self):
+        self.adapter.close()
+
+
+def lookup(cache, url):
+    """
+    Check the cache before a request
+
+    Returns (done, text, headers): done means the cache answered (text is the
+    body, or None for a negative entry); otherwise send headers with the request.
+    """
+    entry = cache.get(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        cache.note('hit')
+        return True, (entry.body if entry.status == 200 else None), {}
+    return False, None, ResponseCache.validators(entry)
+
+
+def fetch_text(session, url, timeout, cache=None, max_bytes=MAX_PAGE_BYTES, stop=None,
+               scheduler=None, abandon=None):
+    """
+    GET a page and return its text, or None on any failure (cache-aware)
+
+    The body is streamed: non-text answers are dropped unread, at most
+    max_bytes are read, and reading ends early once stop(text) is true.
+    Only bodies read to the end are cached; a cut-short page is refetched.
+
+    A scheduler delays the request until its host's slot (cache hits are not
+    delayed); if abandon is set during that wait, nothing is requested.
+    """
+    done, text, headers = lookup(cache, url)
+    if done:
+        return text
+    if scheduler and not scheduler.wait(url, abandon):
+        return None
+    try:
+        with session.get(url, timeout=timeout, allow_redirects=True, headers=headers, stream=True) as response:
+            if response.status_code == 304 and cache:
+                entry = cache.get(url)
+                if entry:
+                    cache.note('revalidated')
+                    cache.refresh(url, response.headers)
+                    return entry.body
+            if cache:
+                cache.note('miss')
+                if response.status_code in ResponseCache.NEGATIVE_STATUSES:
+                    cache.store(url, response.status_code, None, response.headers)
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if not is_text_content(content_type):
+                logger.debug(f"Skipping {content_type}: {url}")
+                return None
+            body = StreamedBody(response.encoding, max_bytes, stop)
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if not body.feed(chunk):
+                    break
+            text = body.text()
+            if body.truncated:
+                logger.debug(f"Read only the first {max_bytes} bytes of {url}")
+        if cache and response.status_code == 200 and body.complete:
+            cache.store(url, response.status_code, text, response.headers)
+        return text
+    except requests.exceptions.Timeout:
+        logger.debug(f"Timeout fetching {url}")
+        return None
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 404:
+            logger.debug(f"404 Not Found: {url}")
+        else:
+            logger.debug(f"HTTP error {e.response.status_code}: {url}")
+        return None
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"Error fetching {url}: {e}")
+        return None